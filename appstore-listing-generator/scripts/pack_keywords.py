@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+App Store Keyword Packer
+
+Choose the highest-scoring set of candidate keywords that fits the App Store
+keywords field (100 characters, comma-separated, no spaces after commas).
+Candidates are split into single words, because the App Store combines indexed
+words into search phrases on its own, so no word is ever packed twice. Words
+already present in the app name or subtitle are removed, since the App Store
+indexes those fields anyway. The selection is solved exactly as a 0/1 knapsack
+with dynamic programming, one locale at a time.
+
+Input is a CSV spreadsheet with one candidate per row:
+
+    locale,keyword,score,app_name,subtitle
+    en-US,party games,9,PartyPal,Party Toolbox
+    en-US,dice,6,,
+    zh-Hans,聚会游戏,8,派对宝,聚会玩具箱
+
+app_name and subtitle are optional and only need to be filled on one row per locale.
+
+Usage:
+    python pack_keywords.py keywords.csv --output keywords_packed.csv
+"""
+
+import argparse
+import csv
+import json
+import sys
+from typing import Dict, List, Tuple
+
+KEYWORDS_LIMIT = 100
+
+
+def normalize(text: str) -> str:
+    """Lower-case and collapse whitespace for comparisons."""
+    return " ".join(text.casefold().split())
+
+
+def field_length(text: str, unit: str = "chars") -> int:
+    """Length of text as counted against the field limit ("chars" or "bytes")."""
+    return len(text.encode('utf-8')) if unit == "bytes" else len(text)
+
+
+def prepare_candidates(
+    candidates: List[Tuple[str, float]],
+    app_name: str = "",
+    subtitle: str = ""
+) -> Tuple[List[Tuple[str, float]], List[str]]:
+    """Split candidates into single keywords, drop covered words and merge duplicates.
+
+    The App Store matches searches against any combination of indexed words, so a
+    phrase such as "party games" is packed as the separate keywords "party" and
+    "games". Each word keeps the highest score of the candidates it came from, which
+    guarantees that no word appears twice in the packed field.
+
+    Args:
+        candidates: (keyword, score) pairs; a keyword may be a phrase or a
+            comma-separated list
+        app_name: App name for this locale
+        subtitle: Subtitle for this locale
+
+    Returns:
+        Tuple of (remaining (keyword, score) pairs, dropped words)
+    """
+    indexed_text = normalize(f"{app_name} {subtitle}")
+    indexed_words = set(indexed_text.split())
+
+    best: Dict[str, float] = {}
+    dropped: Dict[str, None] = {}
+    for keyword, score in candidates:
+        for word in normalize(keyword.replace(",", " ")).split():
+            # Scripts such as Chinese and Japanese are not space-separated, so match substrings
+            covered = word in indexed_words or (not word.isascii() and word in indexed_text)
+            if covered or score <= 0:
+                dropped.setdefault(word)
+                continue
+            best[word] = max(score, best.get(word, score))
+
+    return list(best.items()), [word for word in dropped if word not in best]
+
+
+def pack_keywords(
+    candidates: List[Tuple[str, float]],
+    limit: int = KEYWORDS_LIMIT,
+    unit: str = "chars"
+) -> List[str]:
+    """Select the subset of keywords with the highest total score that fits the limit.
+
+    Every keyword after the first costs one extra unit for its comma, so each item
+    is weighed at length + 1 against a capacity of limit + 1.
+
+    Args:
+        candidates: (keyword, score) pairs from prepare_candidates
+        limit: Field limit
+        unit: "chars" or "bytes"
+
+    Returns:
+        Selected keywords, highest score first
+    """
+    capacity = limit + 1
+    items = [(kw, score, field_length(kw, unit) + 1) for kw, score in candidates]
+    items = [item for item in items if item[2] <= capacity]
+
+    # best[c] is the highest score achievable with total cost <= c
+    best = [0.0] * (capacity + 1)
+    taken = []
+    for _, score, cost in items:
+        row = [False] * (capacity + 1)
+        for c in range(capacity, cost - 1, -1):
+            candidate = best[c - cost] + score
+            if candidate > best[c]:
+                best[c] = candidate
+                row[c] = True
+        taken.append(row)
+
+    selected = []
+    c = capacity
+    for i in range(len(items) - 1, -1, -1):
+        if taken[i][c]:
+            selected.append(items[i])
+            c -= items[i][2]
+
+    selected.sort(key=lambda item: (-item[1], item[0]))
+    return [kw for kw, _, _ in selected]
+
+
+def read_spreadsheet(path: str) -> Dict[str, Dict]:
+    """Read candidates grouped by locale from a CSV file ("-" for stdin)."""
+    f = sys.stdin if path == "-" else open(path, newline='', encoding='utf-8-sig')
+    try:
+        reader = csv.DictReader(f)
+        missing = {"locale", "keyword", "score"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Missing columns in {path}: {', '.join(sorted(missing))}")
+
+        locales: Dict[str, Dict] = {}
+        for line, row in enumerate(reader, 2):
+            locale = (row["locale"] or "").strip()
+            keyword = (row["keyword"] or "").strip()
+            if not locale or not keyword:
+                continue
+            try:
+                score = float(row["score"])
+            except (TypeError, ValueError):
+                raise ValueError(f"{path}:{line}: invalid score {row['score']!r}")
+
+            entry = locales.setdefault(locale, {"app_name": "", "subtitle": "", "candidates": []})
+            entry["candidates"].append((keyword, score))
+            for field in ("app_name", "subtitle"):
+                if row.get(field) and not entry[field]:
+                    entry[field] = row[field].strip()
+        return locales
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def pack_spreadsheet(path: str, limit: int = KEYWORDS_LIMIT, unit: str = "chars") -> List[Dict]:
+    """Pack the keyword field for every locale in a spreadsheet.
+
+    Returns:
+        One result dict per locale with the packed field, its length and score
+    """
+    results = []
+    for locale, entry in read_spreadsheet(path).items():
+        candidates, dropped = prepare_candidates(entry["candidates"], entry["app_name"], entry["subtitle"])
+        selected = pack_keywords(candidates, limit, unit)
+        scores = dict(candidates)
+        field = ",".join(selected)
+        results.append({
+            "locale": locale,
+            "keywords": field,
+            "length": field_length(field, unit),
+            "score": sum(scores[kw] for kw in selected),
+            "dropped": dropped,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Pack the App Store keywords field for each locale',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Print packed keywords for every locale
+  python pack_keywords.py keywords.csv
+
+  # Count UTF-8 bytes instead of characters and write JSON
+  python pack_keywords.py keywords.csv --unit bytes --json --output keywords.json
+        """
+    )
+    parser.add_argument('spreadsheet', help='CSV with locale, keyword, score (and optional app_name, subtitle) columns')
+    parser.add_argument('--limit', type=int, default=KEYWORDS_LIMIT,
+                        help=f'Keywords field limit (default: {KEYWORDS_LIMIT})')
+    parser.add_argument('--unit', choices=['chars', 'bytes'], default='chars',
+                        help='Count the limit in characters or UTF-8 bytes (default: chars)')
+    parser.add_argument('--json', action='store_true', help='Write JSON instead of CSV')
+    parser.add_argument('--output', help='Output file (default: stdout)')
+
+    args = parser.parse_args()
+
+    try:
+        results = pack_spreadsheet(args.spreadsheet, args.limit, args.unit)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.json:
+            json.dump(results, out, indent=2, ensure_ascii=False)
+            out.write("\n")
+        else:
+            writer = csv.writer(out)
+            writer.writerow(["locale", "keywords", "length", "score", "dropped"])
+            for result in results:
+                writer.writerow([result["locale"], result["keywords"], result["length"],
+                                 f"{result['score']:g}", ",".join(result["dropped"])])
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.output:
+        print(f"✓ Packed keywords for {len(results)} locales: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Bezel Cache
+
+Persistent on-disk cache of decoded device bezels. Each bezel PNG is decoded once
+into raw RGBA pixels behind a small header and stored under a name derived from the
+source file's SHA-256, so editing a bezel automatically invalidates its entry.
+Generator processes memory-map the cached files, letting every CLI run and worker
+share the same pages through the OS page cache instead of inflating the PNG again.
+
+Usage:
+    python bezel_cache.py --warm --bezels-dir ../resources/product-bezels
+    python bezel_cache.py --clear
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Error: Pillow is required. Install with: pip install Pillow")
+    sys.exit(1)
+
+# Header: magic, format version, reserved, width, height, SHA-256 of the source PNG
+CACHE_MAGIC = b"BZLC"
+CACHE_VERSION = 1
+HEADER_FORMAT = "<4sHHII32s"
+HEADER_SIZE = 64
+CACHE_SUFFIX = ".rgba"
+
+
+def default_cache_dir() -> Path:
+    """Return the cache directory, honouring APPSTORE_BEZEL_CACHE_DIR if set."""
+    override = os.environ.get("APPSTORE_BEZEL_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "appstore-screenshot-generator" / "bezels"
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: str, mtime_ns: int, size: int) -> bytes:
+    """Hash a file's contents. Memoized on (path, mtime, size) within a process."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def source_digest(bezel_path: Path) -> bytes:
+    """Return the SHA-256 digest of a bezel PNG."""
+    stat = os.stat(bezel_path)
+    return _file_digest(str(bezel_path), stat.st_mtime_ns, stat.st_size)
+
+
+def cache_path_for(digest: bytes, cache_dir: Optional[Path] = None) -> Path:
+    """Return the cache file path for a source digest."""
+    return (cache_dir or default_cache_dir()) / f"{digest.hex()}{CACHE_SUFFIX}"
+
+
+def write_cache_entry(bezel_path: Path, cache_dir: Optional[Path] = None) -> Path:
+    """Decode a bezel PNG and write it to the cache as raw RGBA.
+
+    Args:
+        bezel_path: Path to the source bezel PNG
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Path of the written cache file
+    """
+    digest = source_digest(bezel_path)
+    target = cache_path_for(digest, cache_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    bezel = Image.open(bezel_path).convert("RGBA")
+    width, height = bezel.size
+    header = struct.pack(HEADER_FORMAT, CACHE_MAGIC, CACHE_VERSION, 0, width, height, digest)
+
+    # Write to a temporary file first so concurrent readers never see a partial entry
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        f.write(bezel.tobytes("raw", "RGBA"))
+    os.replace(tmp_path, target)
+    return target
+
+
+def _read_header(mapped: mmap.mmap) -> Optional[Tuple[int, int, bytes]]:
+    """Parse a cache header, returning (width, height, digest) or None if invalid."""
+    if len(mapped) < HEADER_SIZE:
+        return None
+    magic, version, _, width, height, digest = struct.unpack_from(HEADER_FORMAT, mapped, 0)
+    if magic != CACHE_MAGIC or version != CACHE_VERSION:
+        return None
+    if len(mapped) != HEADER_SIZE + width * height * 4:
+        return None
+    return width, height, digest
+
+
+def open_cached_bezel(bezel_path: Path, cache_dir: Optional[Path] = None) -> Optional[Image.Image]:
+    """Memory-map the cached copy of a bezel.
+
+    Args:
+        bezel_path: Path to the source bezel PNG
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Read-only RGBA image backed by the mapped file, or None if there is no
+        valid entry for the current contents of bezel_path
+    """
+    digest = source_digest(bezel_path)
+    entry = cache_path_for(digest, cache_dir)
+    try:
+        with open(entry, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    header = _read_header(mapped)
+    if header is None or header[2] != digest:
+        mapped.close()
+        return None
+
+    width, height, _ = header
+    pixels = memoryview(mapped)[HEADER_SIZE:]
+    return Image.frombuffer("RGBA", (width, height), pixels, "raw", "RGBA", 0, 1)
+
+
+def load_bezel(bezel_path: Path, cache_dir: Optional[Path] = None) -> Image.Image:
+    """Load a bezel as RGBA, preferring the memory-mapped cache.
+
+    Falls back to decoding the PNG when no valid cache entry exists. The returned
+    image may be read-only; callers must not modify it in place.
+    """
+    cached = open_cached_bezel(Path(bezel_path), cache_dir)
+    if cached is not None:
+        return cached
+    return Image.open(bezel_path).convert("RGBA")
+
+
+def warm_cache(bezels_dir: str, cache_dir: Optional[Path] = None) -> int:
+    """Build cache entries for every bezel PNG under bezels_dir.
+
+    Returns:
+        Number of entries written (up-to-date entries are skipped)
+    """
+    written = 0
+    for bezel_path in sorted(Path(bezels_dir).rglob("*.png")):
+        entry = cache_path_for(source_digest(bezel_path), cache_dir)
+        if open_cached_bezel(bezel_path, cache_dir) is not None:
+            print(f"  = {bezel_path.name}")
+            continue
+        write_cache_entry(bezel_path, cache_dir)
+        written += 1
+        print(f"  ✓ {bezel_path.name} -> {entry.name}")
+    return written
+
+
+def clear_cache(cache_dir: Optional[Path] = None) -> int:
+    """Delete all cache entries. Returns the number of files removed."""
+    cache_dir = cache_dir or default_cache_dir()
+    if not cache_dir.is_dir():
+        return 0
+    removed = 0
+    for entry in cache_dir.glob(f"*{CACHE_SUFFIX}"):
+        entry.unlink()
+        removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the memory-mapped bezel cache')
+    parser.add_argument('--warm', action='store_true',
+                        help='Decode all bezels under --bezels-dir into the cache')
+    parser.add_argument('--clear', action='store_true', help='Remove all cache entries')
+    parser.add_argument('--bezels-dir', default='product-bezels',
+                        help='Directory containing device bezels')
+    parser.add_argument('--cache-dir', help='Cache directory (default: ~/.cache/appstore-screenshot-generator/bezels)')
+
+    args = parser.parse_args()
+    cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
+
+    if not args.warm and not args.clear:
+        parser.error("one of --warm or --clear is required")
+
+    if args.clear:
+        removed = clear_cache(cache_dir)
+        print(f"✓ Removed {removed} cache entries from {cache_dir}")
+
+    if args.warm:
+        if not Path(args.bezels_dir).is_dir():
+            print(f"Error: Bezels directory not found: {args.bezels_dir}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Warming bezel cache in {cache_dir}...")
+        written = warm_cache(args.bezels_dir, cache_dir)
+        print(f"✓ Wrote {written} cache entries")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Screenshot Regression Checker
+
+Compare a directory of generated marketing screenshots against a golden directory.
+Byte-identical files are accepted from their hashes without decoding; everything
+else is compared with per-pixel and structural similarity (SSIM) metrics, and a
+diff heatmap is written for every failing image.
+
+Usage:
+    python compare_screenshots.py marketing/ golden/ --diff-dir diffs/ --report report.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    from PIL import Image
+except ImportError:
+    print("Error: Pillow is required. Install with: pip install Pillow")
+    sys.exit(1)
+
+try:
+    import numpy as np
+except ImportError:
+    print("Error: NumPy is required. Install with: pip install numpy")
+    sys.exit(1)
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+# A pixel counts as changed when any channel differs by more than this
+DEFAULT_PIXEL_TOLERANCE = 8
+# Maximum fraction of changed pixels before an image fails
+DEFAULT_MAX_CHANGED_RATIO = 0.001
+# Minimum mean SSIM on luminance before an image fails
+DEFAULT_MIN_SSIM = 0.99
+
+SSIM_WINDOW = 8
+SSIM_C1 = (0.01 * 255) ** 2
+SSIM_C2 = (0.03 * 255) ** 2
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _box_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Mean over every window x window block, computed from an integral image."""
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    sums = (integral[window:, window:] - integral[:-window, window:]
+            - integral[window:, :-window] + integral[:-window, :-window])
+    return sums / (window * window)
+
+
+def mean_ssim(a: np.ndarray, b: np.ndarray, window: int = SSIM_WINDOW) -> float:
+    """Mean structural similarity of two greyscale float arrays (sliding box window)."""
+    if min(a.shape) < window:
+        window = min(a.shape)
+    a = a.astype(np.float64)
+    b = b.astype(np.float64)
+    mu_a = _box_mean(a, window)
+    mu_b = _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a * mu_a
+    var_b = _box_mean(b * b, window) - mu_b * mu_b
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+    ssim = ((2 * mu_a * mu_b + SSIM_C1) * (2 * cov + SSIM_C2)) / (
+        (mu_a * mu_a + mu_b * mu_b + SSIM_C1) * (var_a + var_b + SSIM_C2))
+    return float(ssim.mean())
+
+
+def _luminance(rgb: np.ndarray) -> np.ndarray:
+    """ITU-R BT.601 luma of an RGB array."""
+    return rgb[..., 0] * 0.299 + rgb[..., 1] * 0.587 + rgb[..., 2] * 0.114
+
+
+def write_heatmap(golden: np.ndarray, delta: np.ndarray, output_path: Path) -> None:
+    """Write a heatmap with differences in red over a dimmed copy of the golden image."""
+    base = (_luminance(golden.astype(np.float32)) * 0.3).astype(np.uint8)
+    heat = np.stack([base, base, base], axis=-1)
+    intensity = delta.max(axis=-1)
+    changed = intensity > 0
+    heat[changed, 0] = np.maximum(128, intensity[changed]).astype(np.uint8)
+    heat[changed, 1] = 0
+    heat[changed, 2] = 0
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    Image.fromarray(heat, 'RGB').save(output_path)
+
+
+def compare_images(
+    output_path: Path,
+    golden_path: Path,
+    pixel_tolerance: int = DEFAULT_PIXEL_TOLERANCE,
+    max_changed_ratio: float = DEFAULT_MAX_CHANGED_RATIO,
+    min_ssim: float = DEFAULT_MIN_SSIM,
+    heatmap_path: Optional[Path] = None
+) -> Dict:
+    """Compare one generated image against its golden counterpart.
+
+    Args:
+        output_path: Generated image
+        golden_path: Golden image
+        pixel_tolerance: Per-channel difference above which a pixel counts as changed
+        max_changed_ratio: Maximum allowed fraction of changed pixels
+        min_ssim: Minimum allowed mean SSIM
+        heatmap_path: Where to write a diff heatmap if the comparison fails
+
+    Returns:
+        Result dict with "status" ("identical", "pass" or "fail") and metrics
+    """
+    result = {"output": str(output_path), "golden": str(golden_path)}
+
+    if (os.path.getsize(output_path) == os.path.getsize(golden_path)
+            and file_digest(output_path) == file_digest(golden_path)):
+        result["status"] = "identical"
+        return result
+
+    try:
+        golden_img = Image.open(golden_path).convert("RGB")
+    except OSError as e:
+        result.update(status="fail", reason=f"cannot decode golden image: {e}")
+        return result
+    try:
+        output_img = Image.open(output_path).convert("RGB")
+    except OSError as e:
+        result.update(status="fail", reason=f"cannot decode output image: {e}")
+        return result
+    if golden_img.size != output_img.size:
+        result.update(status="fail", reason=(
+            f"size mismatch: {output_img.size[0]}x{output_img.size[1]} "
+            f"vs golden {golden_img.size[0]}x{golden_img.size[1]}"))
+        return result
+
+    golden = np.asarray(golden_img)
+    output = np.asarray(output_img)
+    delta = np.abs(output.astype(np.int16) - golden.astype(np.int16)).astype(np.uint8)
+
+    changed_ratio = float((delta.max(axis=-1) > pixel_tolerance).mean())
+    ssim = mean_ssim(_luminance(output.astype(np.float32)), _luminance(golden.astype(np.float32)))
+    result.update(
+        max_diff=int(delta.max()),
+        mean_diff=round(float(delta.mean()), 4),
+        changed_ratio=round(changed_ratio, 6),
+        ssim=round(ssim, 6),
+    )
+
+    reasons = []
+    if changed_ratio > max_changed_ratio:
+        reasons.append(f"{changed_ratio:.4%} of pixels changed (limit {max_changed_ratio:.4%})")
+    if ssim < min_ssim:
+        reasons.append(f"SSIM {ssim:.4f} below {min_ssim}")
+
+    if reasons:
+        result.update(status="fail", reason="; ".join(reasons))
+        if heatmap_path is not None:
+            write_heatmap(golden, delta, heatmap_path)
+            result["heatmap"] = str(heatmap_path)
+    else:
+        result["status"] = "pass"
+    return result
+
+
+def _compare_task(args: tuple) -> Dict:
+    """Process pool entry point for compare_images."""
+    return compare_images(*args)
+
+
+def _list_images(directory: Path) -> List[Path]:
+    """Relative paths of all images below directory."""
+    return sorted(
+        p.relative_to(directory) for p in directory.rglob("*")
+        if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES
+    )
+
+
+def compare_directories(
+    output_dir: str,
+    golden_dir: str,
+    diff_dir: Optional[str] = None,
+    pixel_tolerance: int = DEFAULT_PIXEL_TOLERANCE,
+    max_changed_ratio: float = DEFAULT_MAX_CHANGED_RATIO,
+    min_ssim: float = DEFAULT_MIN_SSIM,
+    workers: Optional[int] = None
+) -> List[Dict]:
+    """Compare every image in golden_dir with the same relative path in output_dir.
+
+    Args:
+        output_dir: Directory of generated screenshots
+        golden_dir: Directory of golden screenshots
+        diff_dir: Directory for failure heatmaps (mirrors golden layout, named <image>.diff.png), or None
+        pixel_tolerance: Per-channel difference above which a pixel counts as changed
+        max_changed_ratio: Maximum allowed fraction of changed pixels
+        min_ssim: Minimum allowed mean SSIM
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        List of result dicts, one per image found in either directory
+    """
+    output_root = Path(output_dir)
+    golden_root = Path(golden_dir)
+    golden_images = _list_images(golden_root)
+    output_images = set(_list_images(output_root))
+
+    results = []
+    tasks = []
+    for rel_path in golden_images:
+        if rel_path not in output_images:
+            results.append({"output": str(output_root / rel_path), "golden": str(golden_root / rel_path),
+                            "status": "fail", "reason": "missing from output"})
+            continue
+        # Keep the original suffix so x.png and x.jpg get separate heatmaps
+        heatmap = Path(diff_dir) / rel_path.with_name(rel_path.name + ".diff.png") if diff_dir else None
+        tasks.append((output_root / rel_path, golden_root / rel_path,
+                      pixel_tolerance, max_changed_ratio, min_ssim, heatmap))
+
+    for rel_path in sorted(output_images - set(golden_images)):
+        results.append({"output": str(output_root / rel_path), "golden": None,
+                        "status": "fail", "reason": "no golden image"})
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results.extend(pool.map(_compare_task, tasks, chunksize=4))
+
+    return sorted(results, key=lambda r: r["output"])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare generated screenshots against a golden set',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Compare and write heatmaps for failures
+  python compare_screenshots.py marketing/ golden/ --diff-dir diffs/
+
+  # Machine-readable report for CI
+  python compare_screenshots.py marketing/ golden/ --report report.json
+        """
+    )
+    parser.add_argument('output_dir', help='Directory of generated screenshots')
+    parser.add_argument('golden_dir', help='Directory of golden screenshots')
+    parser.add_argument('--diff-dir', help='Write diff heatmaps for failing images here')
+    parser.add_argument('--report', help='Write a JSON report to this path')
+    parser.add_argument('--pixel-tolerance', type=int, default=DEFAULT_PIXEL_TOLERANCE,
+                        help=f'Per-channel difference ignored as noise (default: {DEFAULT_PIXEL_TOLERANCE})')
+    parser.add_argument('--max-changed', type=float, default=DEFAULT_MAX_CHANGED_RATIO,
+                        help=f'Maximum fraction of changed pixels (default: {DEFAULT_MAX_CHANGED_RATIO})')
+    parser.add_argument('--min-ssim', type=float, default=DEFAULT_MIN_SSIM,
+                        help=f'Minimum mean SSIM (default: {DEFAULT_MIN_SSIM})')
+    parser.add_argument('--workers', type=int, help='Number of worker processes (default: CPU count)')
+
+    args = parser.parse_args()
+
+    for directory in (args.output_dir, args.golden_dir):
+        if not Path(directory).is_dir():
+            print(f"Error: Directory not found: {directory}", file=sys.stderr)
+            sys.exit(2)
+
+    results = compare_directories(
+        args.output_dir,
+        args.golden_dir,
+        diff_dir=args.diff_dir,
+        pixel_tolerance=args.pixel_tolerance,
+        max_changed_ratio=args.max_changed,
+        min_ssim=args.min_ssim,
+        workers=args.workers
+    )
+
+    failures = [r for r in results if r["status"] == "fail"]
+    for result in failures:
+        print(f"✗ {result['output']}: {result['reason']}")
+
+    identical = sum(1 for r in results if r["status"] == "identical")
+    passed = sum(1 for r in results if r["status"] == "pass")
+    print(f"\n{len(results)} images: {identical} identical, {passed} within tolerance, {len(failures)} failed")
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({"results": results, "failed": len(failures)}, f, indent=2)
+        print(f"✓ Report written to {args.report}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
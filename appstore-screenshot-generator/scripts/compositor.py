@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Compositor Backends
+
+Pixel operations used by the screenshot renderer (gradient, resize, rounded-corner
+masking, paste and alpha compositing) behind a small backend interface, so the
+pipeline can run on different engines without changes:
+
+    pillow  Pillow image operations (default, reference output)
+    numpy   NumPy arrays in premultiplied float32; requires numpy (about 5-10x
+            slower than pillow, useful as a cross-check rather than for speed)
+
+Each backend works on its own image handle type. The renderer converts to and from
+PIL images only at the edges (loading inputs, drawing text, saving output).
+
+Usage:
+    python compositor.py --check
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageChops, ImageDraw
+except ImportError:
+    print("Error: Pillow is required. Install with: pip install Pillow")
+    sys.exit(1)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class CompositorBackend(ABC):
+    """Interface for the pixel operations used by the renderer.
+
+    Handles returned by one backend may only be passed back to the same backend.
+    Subclasses must implement every method; an incomplete backend cannot be
+    instantiated.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def from_image(self, image: Image.Image):
+        """Convert a PIL image into a backend handle."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def to_image(self, handle, mode: str = "RGBA") -> Image.Image:
+        """Convert a backend handle into a PIL image of the given mode."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def new_canvas(self, size: Tuple[int, int]):
+        """Create a fully transparent RGBA canvas."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def gradient(self, width: int, height: int, top_rgb: Tuple[int, int, int], bottom_rgb: Tuple[int, int, int]):
+        """Create an opaque vertical gradient from top_rgb to bottom_rgb."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def resize(self, handle, size: Tuple[int, int]):
+        """Resize with Lanczos resampling."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def apply_mask(self, handle, mask: Image.Image):
+        """Replace the alpha channel with an L-mode mask of the same size."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def paste(self, dest, src, position: Tuple[int, int]):
+        """Paste src onto dest at position, masked by src's alpha (Image.paste semantics).
+
+        dest may be modified in place; use the returned handle.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def alpha_composite(self, dest, src):
+        """Composite src over dest; both must be the same size."""
+        raise NotImplementedError
+
+
+class PillowBackend(CompositorBackend):
+    """Backend built on Pillow image operations."""
+
+    name = "pillow"
+
+    def from_image(self, image: Image.Image) -> Image.Image:
+        return image if image.mode in ("RGB", "RGBA") else image.convert("RGBA")
+
+    def to_image(self, handle: Image.Image, mode: str = "RGBA") -> Image.Image:
+        return handle if handle.mode == mode else handle.convert(mode)
+
+    def new_canvas(self, size: Tuple[int, int]) -> Image.Image:
+        return Image.new('RGBA', size, (0, 0, 0, 0))
+
+    def gradient(self, width: int, height: int, top_rgb: Tuple[int, int, int], bottom_rgb: Tuple[int, int, int]) -> Image.Image:
+        # Build one column of row colors and stretch it horizontally
+        column = Image.new('RGB', (1, height))
+        column.putdata([
+            tuple(int(top + (bottom - top) * (y / height)) for top, bottom in zip(top_rgb, bottom_rgb))
+            for y in range(height)
+        ])
+        return column.resize((width, height), Image.Resampling.NEAREST)
+
+    def resize(self, handle: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        return handle.resize(size, Image.Resampling.LANCZOS)
+
+    def apply_mask(self, handle: Image.Image, mask: Image.Image) -> Image.Image:
+        result = handle.convert("RGBA") if handle.mode != "RGBA" else handle.copy()
+        result.putalpha(mask)
+        return result
+
+    def paste(self, dest: Image.Image, src: Image.Image, position: Tuple[int, int]) -> Image.Image:
+        dest.paste(src, position, src)
+        return dest
+
+    def alpha_composite(self, dest: Image.Image, src: Image.Image) -> Image.Image:
+        return Image.alpha_composite(dest, src)
+
+
+class NumpyBackend(CompositorBackend):
+    """Backend holding images as H x W x 4 float32 arrays with premultiplied alpha (0-255)."""
+
+    name = "numpy"
+
+    def from_image(self, image: Image.Image) -> "np.ndarray":
+        pixels = np.asarray(image.convert("RGBA"), dtype=np.float32).copy()
+        pixels[..., :3] *= pixels[..., 3:4] / 255.0
+        return pixels
+
+    def to_image(self, handle: "np.ndarray", mode: str = "RGBA") -> Image.Image:
+        image = Image.fromarray(self._to_straight_uint8(handle), "RGBA")
+        return image if mode == "RGBA" else image.convert(mode)
+
+    def new_canvas(self, size: Tuple[int, int]) -> "np.ndarray":
+        width, height = size
+        return np.zeros((height, width, 4), dtype=np.float32)
+
+    def gradient(self, width: int, height: int, top_rgb: Tuple[int, int, int], bottom_rgb: Tuple[int, int, int]) -> "np.ndarray":
+        factor = np.arange(height, dtype=np.float64)[:, None] / height
+        top = np.asarray(top_rgb, dtype=np.float64)
+        bottom = np.asarray(bottom_rgb, dtype=np.float64)
+        # Truncate like int() so rows match the Pillow backend exactly
+        rows = np.trunc(top + (bottom - top) * factor).astype(np.float32)
+        pixels = np.empty((height, width, 4), dtype=np.float32)
+        pixels[..., :3] = rows[:, None, :]
+        pixels[..., 3] = 255.0
+        return pixels
+
+    def resize(self, handle: "np.ndarray", size: Tuple[int, int]) -> "np.ndarray":
+        # Resample each premultiplied channel in float, avoiding 8-bit round trips.
+        # Like Pillow, resample horizontally then vertically and clip in between,
+        # so Lanczos overshoot at hard bezel edges matches the reference.
+        width, height = size
+        resized = handle
+        for pass_size in ((width, handle.shape[0]), (width, height)):
+            channels = [
+                np.asarray(Image.fromarray(np.ascontiguousarray(resized[..., c]), "F").resize(pass_size, Image.Resampling.LANCZOS))
+                for c in range(4)
+            ]
+            resized = np.clip(np.stack(channels, axis=-1), 0.0, 255.0)
+        np.minimum(resized[..., :3], resized[..., 3:4], out=resized[..., :3])
+        return resized
+
+    def apply_mask(self, handle: "np.ndarray", mask: Image.Image) -> "np.ndarray":
+        alpha = np.asarray(mask, dtype=np.float32)
+        result = self._unpremultiply(handle)
+        result[..., 3] = alpha
+        result[..., :3] *= alpha[..., None] / 255.0
+        return result
+
+    def paste(self, dest: "np.ndarray", src: "np.ndarray", position: Tuple[int, int]) -> "np.ndarray":
+        x, y = position
+        dest_h, dest_w = dest.shape[:2]
+        src_h, src_w = src.shape[:2]
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + src_w, dest_w), min(y + src_h, dest_h)
+        if right <= left or bottom <= top:
+            return dest
+
+        region = dest[top:bottom, left:right]
+        layer = src[top - y:bottom - y, left - x:right - x]
+        # Image.paste blends every channel, alpha included, in straight alpha
+        weight = layer[..., 3:4] / 255.0
+        blended = self._unpremultiply(region) * (1.0 - weight) + self._unpremultiply(layer) * weight
+        blended[..., :3] *= blended[..., 3:4] / 255.0
+        region[...] = blended
+        return dest
+
+    def alpha_composite(self, dest: "np.ndarray", src: "np.ndarray") -> "np.ndarray":
+        return src + dest * (1.0 - src[..., 3:4] / 255.0)
+
+    @staticmethod
+    def _unpremultiply(pixels: "np.ndarray") -> "np.ndarray":
+        """Return a straight-alpha copy of a premultiplied array."""
+        straight = pixels.copy()
+        alpha = pixels[..., 3:4]
+        # Premultiplied color is already zero wherever alpha is zero
+        np.divide(pixels[..., :3] * 255.0, alpha, out=straight[..., :3], where=alpha > 0)
+        return straight
+
+    def _to_straight_uint8(self, pixels: "np.ndarray") -> "np.ndarray":
+        straight = self._unpremultiply(pixels)
+        return np.clip(np.rint(straight), 0, 255).astype(np.uint8)
+
+
+COMPOSITOR_BACKENDS = {
+    PillowBackend.name: PillowBackend,
+    NumpyBackend.name: NumpyBackend,
+}
+
+_instances: Dict[str, CompositorBackend] = {}
+
+
+def get_backend(name: str = "pillow") -> CompositorBackend:
+    """Return the compositor backend registered under name.
+
+    Raises:
+        ValueError: If the backend is unknown or its dependencies are missing
+    """
+    if name not in COMPOSITOR_BACKENDS:
+        raise ValueError(
+            f"Unknown compositor backend: {name}\n"
+            f"Available backends: {', '.join(COMPOSITOR_BACKENDS.keys())}"
+        )
+    if name == NumpyBackend.name and np is None:
+        raise ValueError("The numpy compositor backend requires NumPy. Install with: pip install numpy")
+    if name not in _instances:
+        _instances[name] = COMPOSITOR_BACKENDS[name]()
+    return _instances[name]
+
+
+# Largest per-channel difference (premultiplied, 0-255) allowed against the reference backend
+CONFORMANCE_TOLERANCE = 2
+
+
+def _max_difference(a: Image.Image, b: Image.Image) -> int:
+    """Largest per-channel difference between two images, compared premultiplied."""
+    if a.size != b.size or a.mode != b.mode:
+        return 255
+    if a.mode == "RGBA":
+        # Colour under fully transparent pixels is undefined, so compare premultiplied
+        a, b = a.convert("RGBa"), b.convert("RGBa")
+    return max(high for _, high in ImageChops.difference(a, b).getextrema())
+
+
+def _sample_image(size: Tuple[int, int], with_alpha: bool = True) -> Image.Image:
+    """Deterministic test image with smooth and sharp color and alpha changes."""
+    red = Image.linear_gradient("L").resize(size)
+    green = Image.radial_gradient("L").resize(size)
+    blue = Image.linear_gradient("L").rotate(90).resize(size)
+    if not with_alpha:
+        return Image.merge("RGB", (red, green, blue))
+    alpha = Image.radial_gradient("L").point(lambda v: 0 if v > 200 else 255 - v).resize(size)
+    return Image.merge("RGBA", (red, green, blue, alpha))
+
+
+def _rounded_mask(size: Tuple[int, int], radius: int) -> Image.Image:
+    """Rounded-rectangle L mask like the one the renderer uses."""
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), size], radius=radius, fill=255)
+    return mask
+
+
+def _conformance_cases() -> Dict[str, Callable[[CompositorBackend], Image.Image]]:
+    """Operations checked against the reference backend, keyed by name."""
+    layer = _sample_image((240, 320))
+    photo = _sample_image((240, 320), with_alpha=False)
+    backdrop = _sample_image((300, 400), with_alpha=False).transpose(Image.Transpose.ROTATE_180)
+    mask = _rounded_mask((240, 320), 40)
+
+    def masked(engine):
+        return engine.apply_mask(engine.from_image(photo), mask)
+
+    return {
+        "gradient": lambda engine: engine.to_image(engine.gradient(300, 700, (168, 85, 247), (59, 130, 246)), "RGB"),
+        "resize": lambda engine: engine.to_image(engine.resize(engine.from_image(layer), (131, 173))),
+        "apply_mask": lambda engine: engine.to_image(masked(engine)),
+        "paste (transparent)": lambda engine: engine.to_image(
+            engine.paste(engine.new_canvas((300, 400)), masked(engine), (30, 40))),
+        "paste (opaque, clipped)": lambda engine: engine.to_image(
+            engine.paste(engine.from_image(backdrop.copy()), engine.from_image(layer), (-20, 150)), "RGB"),
+        "alpha_composite": lambda engine: engine.to_image(engine.alpha_composite(
+            engine.from_image(layer), engine.from_image(layer.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))),
+    }
+
+
+def _render_case(bezels_dir: Path) -> Callable[[CompositorBackend], Image.Image]:
+    """End-to-end render of a synthetic screenshot through generate_screenshot."""
+    def render(engine):
+        from generate_screenshot import render_marketing_screenshot
+        with tempfile.TemporaryDirectory() as tmp:
+            screenshot_path = Path(tmp) / "screenshot.png"
+            _sample_image((1320, 2868), with_alpha=False).save(screenshot_path)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return render_marketing_screenshot(
+                    str(screenshot_path), title="Conformance", tagline="Check",
+                    bezels_dir=str(bezels_dir), backend=engine.name)
+    return render
+
+
+def check_conformance(bezels_dir: Optional[str] = None, tolerance: int = CONFORMANCE_TOLERANCE) -> bool:
+    """Check every available backend against the Pillow reference.
+
+    Args:
+        bezels_dir: Bezels directory for the end-to-end render case (skipped if missing)
+        tolerance: Largest allowed per-channel difference
+
+    Returns:
+        True if every case on every backend is within tolerance
+    """
+    reference = get_backend(PillowBackend.name)
+    cases = _conformance_cases()
+    if bezels_dir and Path(bezels_dir).is_dir():
+        cases["render"] = _render_case(Path(bezels_dir))
+
+    ok = True
+    for name in COMPOSITOR_BACKENDS:
+        if name == reference.name:
+            continue
+        try:
+            engine = get_backend(name)
+        except ValueError as e:
+            print(f"⚠ Skipping {name}: {e}")
+            continue
+        print(f"Checking {name} against {reference.name}...")
+        for case, run in cases.items():
+            difference = _max_difference(run(reference), run(engine))
+            passed = difference <= tolerance
+            ok = ok and passed
+            print(f"  {'✓' if passed else '✗'} {case}: max difference {difference}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compositor backend utilities')
+    parser.add_argument('--check', action='store_true',
+                        help='Check that every available backend matches the Pillow reference')
+    parser.add_argument('--bezels-dir', default=str(Path(__file__).resolve().parent.parent / "resources" / "product-bezels"),
+                        help='Bezels directory used for the end-to-end render check')
+    parser.add_argument('--tolerance', type=int, default=CONFORMANCE_TOLERANCE,
+                        help=f'Largest allowed per-channel difference (default: {CONFORMANCE_TOLERANCE})')
+    parser.add_argument('--list', action='store_true', help='List backends and exit')
+
+    args = parser.parse_args()
+
+    if args.list:
+        for name in COMPOSITOR_BACKENDS:
+            try:
+                get_backend(name)
+                print(f"  - {name}")
+            except ValueError:
+                print(f"  - {name} (unavailable)")
+        return
+
+    if not args.check:
+        parser.error("one of --check or --list is required")
+
+    if check_conformance(args.bezels_dir, args.tolerance):
+        print("✓ All backends conform")
+    else:
+        print("✗ Some backends differ from the reference", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
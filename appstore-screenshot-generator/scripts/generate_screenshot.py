@@ -11,11 +11,20 @@ Usage:
 """
 
 import argparse
+import hashlib
+import io
 import json
 import os
+import shutil
 import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
 
 try:
     from PIL import Image, ImageDraw, ImageFont, ImageFilter
@@ -23,6 +32,10 @@ except ImportError:
     print("Error: Pillow is required. Install with: pip install Pillow")
     sys.exit(1)
 
+from bezel_cache import load_bezel
+from compositor import COMPOSITOR_BACKENDS, CompositorBackend, get_backend
+from validate_screenshots import check_image, validate_paths
+
 # Screen area is the transparent region where the app screenshot should be placed
 DEVICE_SCREEN_AREAS = {
     "iPhone 17 Pro Max": {
@@ -102,28 +115,36 @@ def create_gradient_background(
     width: int,
     height: int,
     color_top: str,
-    color_bottom: str
+    color_bottom: str,
+    backend: str = "pillow"
 ) -> Image.Image:
     """Create a vertical gradient background."""
-    base = Image.new('RGB', (width, height), color_top)
-    top_rgb = hex_to_rgb(color_top)
-    bottom_rgb = hex_to_rgb(color_bottom)
+    engine = get_backend(backend)
+    gradient = engine.gradient(width, height, hex_to_rgb(color_top), hex_to_rgb(color_bottom))
+    return engine.to_image(gradient, "RGB")
 
-    # Create gradient
-    for y in range(height):
-        # Calculate interpolation factor
-        factor = y / height
 
-        # Interpolate each color channel
-        r = int(top_rgb[0] + (bottom_rgb[0] - top_rgb[0]) * factor)
-        g = int(top_rgb[1] + (bottom_rgb[1] - top_rgb[1]) * factor)
-        b = int(top_rgb[2] + (bottom_rgb[2] - top_rgb[2]) * factor)
+# Fonts tried in order for text overlays (first available wins)
+FONT_CANDIDATES = [
+    ("Hiragino Sans GB", "/System/Library/Fonts/Hiragino Sans GB.ttc"),  # Chinese and English
+    ("STHeiti Medium", "/System/Library/Fonts/STHeiti Medium.ttc"),      # Chinese
+    ("Helvetica", "/System/Library/Fonts/Helvetica.ttc"),
+    ("SF", "/System/Library/Fonts/SFNS.ttf"),
+]
 
-        # Draw horizontal line
-        draw = ImageDraw.Draw(base)
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
 
-    return base
+@lru_cache(maxsize=None)
+def resolve_font_path() -> Optional[str]:
+    """Return the first loadable font from FONT_CANDIDATES, or None for the default bitmap font."""
+    for name, path in FONT_CANDIDATES:
+        try:
+            ImageFont.truetype(path, 12)
+            print(f"✓ Using font: {name}")
+            return path
+        except Exception as e:
+            print(f"✗ {name} not available: {e}")
+    print("⚠ Using default bitmap font (limited quality)")
+    return None
 
 
 def add_text_overlay(
@@ -140,38 +161,13 @@ def add_text_overlay(
     width, height = image.size
 
     # Try to load a nice font, fall back to default if not available
-    try:
-        # Try Hiragino Sans GB (good for Chinese and English, available on macOS)
-        title_font = ImageFont.truetype("/System/Library/Fonts/Hiragino Sans GB.ttc", title_size)
-        tagline_font = ImageFont.truetype("/System/Library/Fonts/Hiragino Sans GB.ttc", tagline_size)
-        print("✓ Using font: Hiragino Sans GB")
-    except Exception as e:
-        print(f"✗ Hiragino Sans GB not available: {e}")
-        try:
-            # Try STHeiti Medium (Chinese font, available on macOS)
-            title_font = ImageFont.truetype("/System/Library/Fonts/STHeiti Medium.ttc", title_size)
-            tagline_font = ImageFont.truetype("/System/Library/Fonts/STHeiti Medium.ttc", tagline_size)
-            print("✓ Using font: STHeiti Medium")
-        except Exception as e:
-            print(f"✗ STHeiti Medium not available: {e}")
-            try:
-                # Try Helvetica as fallback
-                title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", title_size)
-                tagline_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", tagline_size)
-                print("✓ Using font: Helvetica")
-            except Exception as e:
-                print(f"✗ Helvetica not available: {e}")
-                try:
-                    # Try SF fonts
-                    title_font = ImageFont.truetype("/System/Library/Fonts/SFNS.ttf", title_size)
-                    tagline_font = ImageFont.truetype("/System/Library/Fonts/SFNS.ttf", tagline_size)
-                    print("✓ Using font: SF")
-                except Exception as e:
-                    print(f"✗ SF not available: {e}")
-                    # Fall back to default font
-                    title_font = ImageFont.load_default()
-                    tagline_font = ImageFont.load_default()
-                    print("⚠ Using default bitmap font (limited quality)")
+    font_path = resolve_font_path()
+    if font_path:
+        title_font = ImageFont.truetype(font_path, title_size)
+        tagline_font = ImageFont.truetype(font_path, tagline_size)
+    else:
+        title_font = ImageFont.load_default()
+        tagline_font = ImageFont.load_default()
 
     rgb_color = hex_to_rgb(text_color)
 
@@ -290,6 +286,31 @@ def generate_fallback_bezel(
     print(f"✓ Created fallback bezel: {output_path}")
 
 
+def bezel_file_path(device: str, color: str, orientation: str, bezels_dir: str) -> Path:
+    """Return the expected bezel file path for a device, color and orientation."""
+    orientation_str = orientation.capitalize()
+    filename = f"{device} - {color} - {orientation_str}.png"
+    return Path(bezels_dir) / device / filename
+
+
+def available_bezel_colors(device: str, orientation: str, bezels_dir: str) -> List[str]:
+    """Return the colors with a bezel image for a device and orientation."""
+    suffix = f" - {orientation.capitalize()}.png"
+    prefix = f"{device} - "
+    colors = []
+    device_dir = Path(bezels_dir) / device
+    if device_dir.is_dir():
+        for path in device_dir.iterdir():
+            if path.name.startswith(prefix) and path.name.endswith(suffix) and bezel_exists(path):
+                colors.append(path.name[len(prefix):-len(suffix)])
+    return sorted(colors)
+
+
+def bezel_exists(bezel_path: Path) -> bool:
+    """Check that a bezel file exists and is not a placeholder."""
+    return bezel_path.exists() and bezel_path.stat().st_size > 1000
+
+
 def find_bezel_path(
     device: str,
     color: str = "Deep Blue",
@@ -297,14 +318,9 @@ def find_bezel_path(
     bezels_dir: str = "product-bezels"
 ) -> Optional[Path]:
     """Find the bezel image file."""
-    bezel_dir = Path(bezels_dir) / device
-
-    # Construct expected filename
-    orientation_str = orientation.capitalize()
-    filename = f"{device} - {color} - {orientation_str}.png"
-    bezel_path = bezel_dir / filename
+    bezel_path = bezel_file_path(device, color, orientation, bezels_dir)
 
-    if bezel_path.exists() and bezel_path.stat().st_size > 1000:
+    if bezel_exists(bezel_path):
         return bezel_path
 
     print(f"Bezel file not found or invalid: {bezel_path}")
@@ -397,19 +413,19 @@ def detect_device_from_screenshot(screenshot_path: str) -> tuple[str, str]:
     )
 
 
-def composite_screenshot_into_bezel(
+def _composite_into_bezel(
+    engine: CompositorBackend,
     screenshot_path: str,
     bezel_path: Path,
     device: str,
     orientation: str
-) -> Image.Image:
-    """Composite app screenshot into device bezel with rounded corners and bezel overlay.
-
-    Combines rounded corner clipping with bezel overlay for perfect alignment.
-    """
+):
+    """Composite app screenshot into device bezel, returning a backend handle."""
     # Load images
-    screenshot = Image.open(screenshot_path).convert("RGBA")
-    bezel = Image.open(bezel_path).convert("RGBA")
+    screenshot = engine.from_image(Image.open(screenshot_path).convert("RGBA"))
+    # Memory-mapped from the bezel cache when warmed, decoded from PNG otherwise
+    bezel_image = load_bezel(bezel_path)
+    bezel = engine.from_image(bezel_image)
 
     # Get screen area for this device
     if device not in DEVICE_SCREEN_AREAS:
@@ -419,10 +435,7 @@ def composite_screenshot_into_bezel(
     x, y, screen_width, screen_height = screen_area
 
     # Resize screenshot to fit screen area
-    screenshot_resized = screenshot.resize(
-        (screen_width, screen_height),
-        Image.Resampling.LANCZOS
-    )
+    screenshot_resized = engine.resize(screenshot, (screen_width, screen_height))
 
     # Create rounded corner mask
     # iPhone screens have approximately 55-85 pixel corner radius at this resolution
@@ -435,24 +448,37 @@ def composite_screenshot_into_bezel(
     mask = create_rounded_rectangle_mask(screen_width, screen_height, corner_radius)
 
     # Apply rounded corners to screenshot
-    screenshot_with_corners = Image.new('RGBA', (screen_width, screen_height), (0, 0, 0, 0))
-    screenshot_with_corners.paste(screenshot_resized, (0, 0))
-    screenshot_with_corners.putalpha(mask)
+    screenshot_with_corners = engine.apply_mask(screenshot_resized, mask)
 
     # Create a canvas the size of the bezel
-    bezel_width, bezel_height = bezel.size
-    result = Image.new('RGBA', (bezel_width, bezel_height), (0, 0, 0, 0))
+    result = engine.new_canvas(bezel_image.size)
 
     # Paste the rounded screenshot at the screen position
-    result.paste(screenshot_with_corners, (x, y), screenshot_with_corners)
+    result = engine.paste(result, screenshot_with_corners, (x, y))
 
     # Overlay the bezel on top for final polish
-    result = Image.alpha_composite(result, bezel)
+    result = engine.alpha_composite(result, bezel)
 
     return result
 
 
-def generate_marketing_screenshot(
+def composite_screenshot_into_bezel(
+    screenshot_path: str,
+    bezel_path: Path,
+    device: str,
+    orientation: str,
+    backend: str = "pillow"
+) -> Image.Image:
+    """Composite app screenshot into device bezel with rounded corners and bezel overlay.
+
+    Combines rounded corner clipping with bezel overlay for perfect alignment.
+    """
+    engine = get_backend(backend)
+    result = _composite_into_bezel(engine, screenshot_path, bezel_path, device, orientation)
+    return engine.to_image(result)
+
+
+def render_marketing_screenshot(
     screenshot_path: str,
     device: Optional[str] = None,
     color: str = "Deep Blue",
@@ -461,11 +487,11 @@ def generate_marketing_screenshot(
     tagline: Optional[str] = None,
     bg_top: str = "#A855F7",
     bg_bottom: str = "#3B82F6",
-    output_path: str = "output.png",
     bezels_dir: str = "product-bezels",
-    canvas_size: str = "iPhone 6.9"
-) -> None:
-    """Generate a complete marketing screenshot.
+    canvas_size: str = "iPhone 6.9",
+    backend: str = "pillow"
+) -> Image.Image:
+    """Render a complete marketing screenshot in memory.
 
     Args:
         screenshot_path: Path to the app screenshot
@@ -476,10 +502,14 @@ def generate_marketing_screenshot(
         tagline: App tagline text (optional)
         bg_top: Top gradient color
         bg_bottom: Bottom gradient color
-        output_path: Output file path
         bezels_dir: Directory containing device bezels
         canvas_size: App Store canvas size (default: "iPhone 6.9")
+        backend: Compositor backend for pixel operations (default: "pillow")
+
+    Returns:
+        RGB image at the App Store canvas size
     """
+    engine = get_backend(backend)
 
     # Validate inputs
     if not os.path.exists(screenshot_path):
@@ -572,31 +602,32 @@ def generate_marketing_screenshot(
 
     # Create gradient background
     print("Creating gradient background...")
-    background = create_gradient_background(canvas_width, canvas_height, bg_top, bg_bottom)
+    background = engine.gradient(canvas_width, canvas_height, hex_to_rgb(bg_top), hex_to_rgb(bg_bottom))
 
     # Add text overlay
     print("Adding text overlay...")
-    background = add_text_overlay(
-        background, 
+    text_image = add_text_overlay(
+        engine.to_image(background, "RGB"),
         title, 
         tagline, 
         title_size=title_fs, 
         tagline_size=tagline_fs,
         y_offset=y_offset
     )
+    background = engine.from_image(text_image)
 
     # Composite screenshot into bezel
     print("Compositing screenshot into bezel...")
-    device_with_screenshot = composite_screenshot_into_bezel(
-        screenshot_path, bezel_path, device, orientation
+    device_with_screenshot = _composite_into_bezel(
+        engine, screenshot_path, bezel_path, device, orientation
     )
 
     # Scale the bezel to fit within canvas
     if scale != 1.0:
         print(f"Resizing bezel from {bezel_width}x{bezel_height} to {scaled_bezel_width}x{scaled_bezel_height}...")
-        device_with_screenshot = device_with_screenshot.resize(
-            (scaled_bezel_width, scaled_bezel_height),
-            Image.Resampling.LANCZOS
+        device_with_screenshot = engine.resize(
+            device_with_screenshot,
+            (scaled_bezel_width, scaled_bezel_height)
         )
 
     # Calculate bezel position
@@ -609,53 +640,505 @@ def generate_marketing_screenshot(
     bezel_y = text_space + vertical_margin_top
 
     print(f"Placing bezel at position: ({bezel_x}, {bezel_y})")
-    background.paste(device_with_screenshot, (bezel_x, bezel_y), device_with_screenshot)
+    background = engine.paste(background, device_with_screenshot, (bezel_x, bezel_y))
+
+    return engine.to_image(background, "RGB")
+
+
+def generate_marketing_screenshot(
+    screenshot_path: str,
+    device: Optional[str] = None,
+    color: str = "Deep Blue",
+    orientation: Optional[str] = None,
+    title: str = "",
+    tagline: Optional[str] = None,
+    bg_top: str = "#A855F7",
+    bg_bottom: str = "#3B82F6",
+    output_path: str = "output.png",
+    bezels_dir: str = "product-bezels",
+    canvas_size: str = "iPhone 6.9",
+    backend: str = "pillow"
+) -> None:
+    """Generate a complete marketing screenshot and save it as PNG.
+
+    Args:
+        screenshot_path: Path to the app screenshot
+        device: Device model (optional, auto-detected from screenshot size if not provided)
+        color: Bezel color (default: "Deep Blue")
+        orientation: Orientation (optional, auto-detected if not provided)
+        title: App title text
+        tagline: App tagline text (optional)
+        bg_top: Top gradient color
+        bg_bottom: Bottom gradient color
+        output_path: Output file path
+        bezels_dir: Directory containing device bezels
+        canvas_size: App Store canvas size (default: "iPhone 6.9")
+        backend: Compositor backend for pixel operations (default: "pillow")
+    """
+    result = render_marketing_screenshot(
+        screenshot_path,
+        device=device,
+        color=color,
+        orientation=orientation,
+        title=title,
+        tagline=tagline,
+        bg_top=bg_top,
+        bg_bottom=bg_bottom,
+        bezels_dir=bezels_dir,
+        canvas_size=canvas_size,
+        backend=backend
+    )
 
     # Save result
     print(f"Saving to {output_path}...")
-    background.save(output_path, "PNG", quality=95)
+    result.save(output_path, "PNG", quality=95)
     print(f"✓ Marketing screenshot generated: {output_path}")
-    print(f"  Canvas: {canvas_width}x{canvas_height} ({canvas_size})")
-    print(f"  Bezel: {scaled_bezel_width}x{scaled_bezel_height} at ({bezel_x}, {bezel_y})")
+    print(f"  Canvas: {result.width}x{result.height} ({canvas_size})")
+
+
+def _render_kwargs(screenshot_config: dict, global_bezels_dir: str, global_canvas_size: str, global_backend: str = 'pillow') -> dict:
+    """Build render_marketing_screenshot arguments for one config entry."""
+    return dict(
+        screenshot_path=screenshot_config.get('input'),
+        device=screenshot_config.get('device'),  # Optional, will auto-detect if not provided
+        color=screenshot_config.get('color', 'Deep Blue'),
+        orientation=screenshot_config.get('orientation'),  # Optional, will auto-detect if not provided
+        title=screenshot_config.get('title', ''),
+        tagline=screenshot_config.get('tagline'),
+        bg_top=screenshot_config.get('background', {}).get('top', '#A855F7'),
+        bg_bottom=screenshot_config.get('background', {}).get('bottom', '#3B82F6'),
+        # Per-screenshot settings override global settings
+        bezels_dir=screenshot_config.get('bezels_dir', global_bezels_dir),
+        canvas_size=screenshot_config.get('canvas_size', global_canvas_size),
+        backend=screenshot_config.get('backend', global_backend)
+    )
+
+
+def estimate_render_cost(
+    source_size: Tuple[int, int],
+    device: str,
+    orientation: str,
+    bezel_size: Tuple[int, int],
+    canvas_size: str
+) -> dict:
+    """Estimate the pixel work and peak memory of rendering one screenshot.
+
+    Counts the pixels touched by each stage (decode and resize of the screenshot,
+    masking, compositing and scaling at bezel resolution, and background, text and
+    paste at canvas resolution). Memory assumes 4 bytes per RGBA pixel and 3 per
+    RGB pixel for the buffers alive at the compositing step.
+
+    Returns:
+        Dict with "pixels" and "memory_bytes"
+    """
+    source_px = source_size[0] * source_size[1]
+    _, _, screen_w, screen_h = DEVICE_SCREEN_AREAS[device][orientation]
+    screen_px = screen_w * screen_h
+    bezel_px = bezel_size[0] * bezel_size[1]
+    canvas_w, canvas_h = APPSTORE_DIMENSIONS[canvas_size]
+    canvas_px = canvas_w * canvas_h
+    return {
+        "pixels": source_px + 3 * screen_px + 3 * bezel_px + 3 * canvas_px,
+        "memory_bytes": 4 * (source_px + 2 * screen_px + 3 * bezel_px) + 3 * canvas_px,
+    }
+
+
+def _plan_entry(screenshot_config: dict, global_bezels_dir: str, global_canvas_size: str, global_backend: str, export: bool) -> Tuple[Optional[dict], Optional[dict], List[str], List[str]]:
+    """Resolve one config entry without rendering it.
+
+    Returns:
+        Tuple of (resolved render arguments, cost estimate, errors, warnings);
+        the render arguments and cost are None when there are errors
+    """
+    errors = []
+    warnings = []
+
+    background = screenshot_config.get('background', {})
+    if not isinstance(background, dict):
+        errors.append(f"'background' must be an object with 'top' and 'bottom', got {type(background).__name__}")
+        # Drop it so the remaining settings can still be checked
+        screenshot_config = {k: v for k, v in screenshot_config.items() if k != 'background'}
+
+    render = _render_kwargs(screenshot_config, global_bezels_dir, global_canvas_size, global_backend)
+
+    source_size = None
+    screenshot_path = render['screenshot_path']
+    if not screenshot_path:
+        errors.append("missing 'input'")
+    elif not os.path.exists(screenshot_path):
+        errors.append(f"Screenshot not found: {screenshot_path}")
+    else:
+        try:
+            with Image.open(screenshot_path) as img:
+                source_size = img.size
+        except Exception as e:
+            errors.append(f"Cannot read screenshot {screenshot_path}: {e}")
+
+    output_path = screenshot_config.get('output')
+    if not export:
+        if not output_path:
+            errors.append("missing 'output'")
+        else:
+            # Catch unwritable outputs now rather than after rendering
+            output_dir = Path(output_path).parent
+            if not output_dir.is_dir():
+                errors.append(f"Output directory does not exist: {output_dir}")
+            elif not os.access(output_dir, os.W_OK):
+                errors.append(f"Output directory is not writable: {output_dir}")
+
+    if render['canvas_size'] not in APPSTORE_DIMENSIONS:
+        errors.append(
+            f"Unknown canvas size: {render['canvas_size']} "
+            f"(available: {', '.join(APPSTORE_DIMENSIONS.keys())})"
+        )
+
+    try:
+        get_backend(render['backend'])
+    except ValueError as e:
+        errors.append(str(e).split("\n")[0])
+
+    for key in ('bg_top', 'bg_bottom'):
+        try:
+            hex_to_rgb(render[key])
+        except (AttributeError, TypeError, ValueError):
+            errors.append(f"Invalid background color: {render[key]!r} (expected hex like #A855F7)")
+
+    # Resolve device and orientation the same way rendering would
+    if source_size and (render['device'] is None or render['orientation'] is None):
+        try:
+            detected_device, detected_orientation = detect_device_from_screenshot(screenshot_path)
+            render['device'] = render['device'] or detected_device
+            render['orientation'] = render['orientation'] or detected_orientation
+        except ValueError as e:
+            errors.append(str(e).split("\\n")[0])
+
+    device, orientation = render['device'], render['orientation']
+    bezel_size = None
+    if device is not None and device not in DEVICE_SCREEN_AREAS:
+        errors.append(f"Unknown device: {device} (available: {', '.join(DEVICE_SCREEN_AREAS.keys())})")
+    elif device is not None and orientation not in DEVICE_SCREEN_AREAS[device]:
+        errors.append(
+            f"Unsupported orientation for {device}: {orientation} "
+            f"(available: {', '.join(DEVICE_SCREEN_AREAS[device].keys())})"
+        )
+    elif device is not None:
+        bezel_path = bezel_file_path(device, render['color'], orientation, render['bezels_dir'])
+        if bezel_exists(bezel_path):
+            try:
+                with Image.open(bezel_path) as img:
+                    bezel_size = img.size
+            except Exception as e:
+                errors.append(f"Cannot read bezel {bezel_path}: {e}")
+        else:
+            # Only an explicit color is checked; the default falls back like the renderer does
+            available_colors = []
+            if 'color' in screenshot_config:
+                available_colors = available_bezel_colors(device, orientation, render['bezels_dir'])
+            if available_colors:
+                # The device has real bezels, so a missing color is almost certainly a typo
+                errors.append(
+                    f"Unknown bezel color for {device} ({orientation}): {render['color']} "
+                    f"(available: {', '.join(available_colors)})"
+                )
+            else:
+                warnings.append(f"Bezel not found, a fallback will be generated: {bezel_path}")
+                screen_x, screen_y, screen_w, screen_h = DEVICE_SCREEN_AREAS[device][orientation]
+                bezel_size = (screen_w + screen_x * 2, screen_h + screen_y * 2)
+
+    if errors:
+        return None, None, errors, warnings
+
+    cost = estimate_render_cost(source_size, device, orientation, bezel_size, render['canvas_size'])
+    return render, cost, errors, warnings
+
+
+def compile_plan(
+    config: dict,
+    default_bezels_dir: str = 'product-bezels',
+    default_canvas_size: str = 'iPhone 6.9',
+    export: bool = False,
+    default_backend: str = 'pillow'
+) -> dict:
+    """Resolve every config entry up front into a render plan.
+
+    Validates inputs, output directories, canvas sizes, colors, devices, orientations
+    and bezels for all entries and collects every problem instead of stopping at the
+    first. Entries with identical render settings are merged into one job with
+    several targets (rendered once, then copied); an entry repeating both the
+    settings and the target of an earlier entry is skipped as a duplicate. Jobs are
+    ordered by estimated pixel work, most expensive first.
+
+    Args:
+        config: Parsed JSON configuration
+        default_bezels_dir: Default bezels directory, used if not specified in config
+        default_canvas_size: Default canvas size, used if not specified in config
+        export: Plan for --export, where target paths are archive paths
+            (<locale>/<canvas size>/<file name>) instead of output files
+        default_backend: Default compositor backend, used if not specified in config
+
+    Returns:
+        Plan dict with "jobs", "errors", "warnings", "duplicates" (skipped entries),
+        "copies" (targets copied from a shared render), "font" and "totals"
+    """
+    errors = []
+    warnings = []
+
+    if not isinstance(config, dict):
+        errors.append(f"config must be a JSON object, got {type(config).__name__}")
+        config = {}
+
+    global_bezels_dir = config.get('bezels_dir', default_bezels_dir)
+    global_canvas_size = config.get('canvas_size', default_canvas_size)
+    global_backend = config.get('backend', default_backend)
+    global_locale = config.get('locale', 'en-US')
+    screenshots = config.get('screenshots', [])
+    if not isinstance(screenshots, list):
+        errors.append(f"'screenshots' must be a list, got {type(screenshots).__name__}")
+        screenshots = []
+
+    jobs = {}
+    claimed = {}  # normalized target path -> (entry number, job key)
+    duplicates = 0
+
+    for i, screenshot_config in enumerate(screenshots, 1):
+        if not isinstance(screenshot_config, dict):
+            errors.append(f"entry {i}: expected an object, got {type(screenshot_config).__name__}")
+            continue
+
+        render, cost, entry_errors, entry_warnings = _plan_entry(
+            screenshot_config, global_bezels_dir, global_canvas_size, global_backend, export
+        )
+        errors.extend(f"entry {i}: {e}" for e in entry_errors)
+        warnings.extend(f"entry {i}: {w}" for w in entry_warnings)
+        if render is None:
+            continue
+
+        locale = screenshot_config.get('locale', global_locale)
+        if export:
+            file_name = Path(screenshot_config.get('output') or render['screenshot_path']).with_suffix('.png').name
+            path = f"{locale}/{render['canvas_size']}/{file_name}"
+        else:
+            path = screenshot_config['output']
+
+        key = json.dumps(render, sort_keys=True)
+        # Compare targets by resolved path so "out/a.png" and "./out/a.png" collide
+        target = os.path.normpath(path) if export else str(Path(path).resolve())
+        if target in claimed:
+            other_entry, other_key = claimed[target]
+            if other_key == key:
+                duplicates += 1
+            else:
+                errors.append(f"entry {i}: {path} is also written by entry {other_entry}")
+            continue
+        claimed[target] = (i, key)
+
+        job = jobs.setdefault(key, {"entries": [], "targets": [], "render": render, "cost": cost})
+        job["entries"].append(i)
+        job["targets"].append({"path": path, "locale": locale})
+
+    ordered = sorted(jobs.values(), key=lambda job: job["cost"]["pixels"], reverse=True)
+    return {
+        "entries": len(screenshots),
+        "jobs": ordered,
+        "duplicates": duplicates,
+        "copies": sum(len(job["targets"]) - 1 for job in ordered),
+        "errors": errors,
+        "warnings": warnings,
+        "font": resolve_font_path() if ordered else None,
+        "totals": {
+            "pixels": sum(job["cost"]["pixels"] for job in ordered),
+            "peak_memory_bytes": max((job["cost"]["memory_bytes"] for job in ordered), default=0),
+        },
+    }
+
+
+def load_plan(
+    config_path: str,
+    default_bezels_dir: str = 'product-bezels',
+    default_canvas_size: str = 'iPhone 6.9',
+    export: bool = False,
+    default_backend: str = 'pillow'
+) -> dict:
+    """Read a JSON configuration file and compile its plan, failing on any error.
+
+    Raises:
+        ValueError: If any entry is invalid (the message lists all of them)
+    """
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+
+    plan = compile_plan(config, default_bezels_dir, default_canvas_size, export, default_backend)
+    for warning in plan["warnings"]:
+        print(f"⚠ {warning}")
+    if plan["errors"]:
+        raise ValueError(
+            f"{len(plan['errors'])} problem(s) in {config_path}:\n"
+            + "\n".join(f"  ✗ {e}" for e in plan["errors"])
+        )
+    if plan["duplicates"]:
+        print(f"Skipping {plan['duplicates']} duplicate entries")
+    if plan["copies"]:
+        shared = [job for job in plan["jobs"] if len(job["targets"]) > 1]
+        print(f"{plan['copies']} entries share settings with another entry: "
+              f"rendered once, copied to {sum(len(job['targets']) for job in shared)} targets")
+    return plan
 
 
-def generate_from_config(config_path: str, default_bezels_dir: str = 'product-bezels', default_canvas_size: str = 'iPhone 6.9') -> None:
+def generate_from_config(config_path: str, default_bezels_dir: str = 'product-bezels', default_canvas_size: str = 'iPhone 6.9', default_backend: str = 'pillow', validate: bool = False) -> None:
     """Generate screenshots from a JSON configuration file.
 
+    All entries are validated before anything is rendered; see compile_plan.
+
     Args:
         config_path: Path to JSON configuration file
         default_bezels_dir: Default bezels directory (from command-line), used if not specified in config
         default_canvas_size: Default canvas size (from command-line), used if not specified in config
+        default_backend: Default compositor backend (from command-line), used if not specified in config
+        validate: Check every output against App Store requirements after rendering
+
+    Raises:
+        ValueError: If validate is set and any output violates the requirements
     """
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+    jobs = load_plan(config_path, default_bezels_dir, default_canvas_size, default_backend=default_backend)["jobs"]
 
-    # Get global settings from config, or use command-line defaults
-    global_bezels_dir = config.get('bezels_dir', default_bezels_dir)
-    global_canvas_size = config.get('canvas_size', default_canvas_size)
+    for i, job in enumerate(jobs, 1):
+        print(f"\\n[{i}/{len(jobs)}] Generating screenshot...")
 
-    screenshots = config.get('screenshots', [])
+        first, *copies = job["targets"]
+        generate_marketing_screenshot(output_path=first["path"], **job["render"])
+        # Entries with identical settings are rendered once and copied
+        for target in copies:
+            shutil.copyfile(first["path"], target["path"])
+            print(f"✓ Copied to {target['path']}")
 
-    for i, screenshot_config in enumerate(screenshots, 1):
-        print(f"\\n[{i}/{len(screenshots)}] Generating screenshot...")
+    if validate:
+        outputs = [target["path"] for job in jobs for target in job["targets"]]
+        results = validate_paths(outputs, APPSTORE_DIMENSIONS.values())
+        _report_violations([(r["path"], r["problems"]) for r in results])
 
-        # Per-screenshot settings override global settings
-        bezels_dir = screenshot_config.get('bezels_dir', global_bezels_dir)
-        canvas_size = screenshot_config.get('canvas_size', global_canvas_size)
 
-        generate_marketing_screenshot(
-            screenshot_path=screenshot_config['input'],
-            device=screenshot_config.get('device'),  # Optional, will auto-detect if not provided
-            color=screenshot_config.get('color', 'Deep Blue'),
-            orientation=screenshot_config.get('orientation'),  # Optional, will auto-detect if not provided
-            title=screenshot_config.get('title', ''),
-            tagline=screenshot_config.get('tagline'),
-            bg_top=screenshot_config.get('background', {}).get('top', '#A855F7'),
-            bg_bottom=screenshot_config.get('background', {}).get('bottom', '#3B82F6'),
-            output_path=screenshot_config['output'],
-            bezels_dir=bezels_dir,
-            canvas_size=canvas_size
+def _encode_png(render_kwargs: dict) -> Tuple[bytes, int, int]:
+    """Render one screenshot and return (png_bytes, width, height). Runs in a worker process."""
+    image = render_marketing_screenshot(**render_kwargs)
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue(), image.width, image.height
+
+
+def _archive_mode(archive_path: str) -> str:
+    """Return the zipfile/tarfile write mode for an archive path.
+
+    Raises:
+        ValueError: If the extension is not a supported archive type
+    """
+    name = archive_path.lower()
+    if name.endswith('.zip'):
+        return 'zip'
+    if name.endswith('.tar'):
+        return 'w'
+    if name.endswith(('.tar.gz', '.tgz')):
+        return 'w:gz'
+    raise ValueError(f"Unsupported archive type: {archive_path} (use .zip, .tar, .tar.gz or .tgz)")
+
+
+@contextmanager
+def _open_archive(archive_path: str):
+    """Open a ZIP or tar archive for writing and yield an add(arcname, data) function.
+
+    The archive is written to a temporary file next to archive_path and only moved
+    into place when the block completes, so a failed export leaves nothing behind.
+    """
+    mode = _archive_mode(archive_path)
+    target = Path(archive_path)
+    tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        if mode == 'zip':
+            # PNG data is already deflated by the workers, so store it without recompressing
+            with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED) as archive:
+                yield archive.writestr
+        else:
+            with tarfile.open(tmp_path, mode) as archive:
+                def add(arcname: str, data: bytes) -> None:
+                    info = tarfile.TarInfo(arcname)
+                    info.size = len(data)
+                    info.mtime = int(time.time())
+                    archive.addfile(info, io.BytesIO(data))
+                yield add
+        os.replace(tmp_path, target)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def export_from_config(
+    config_path: str,
+    archive_path: str,
+    default_bezels_dir: str = 'product-bezels',
+    default_canvas_size: str = 'iPhone 6.9',
+    workers: Optional[int] = None,
+    default_backend: str = 'pillow',
+    validate: bool = False
+) -> None:
+    """Render screenshots from a JSON configuration file straight into an archive.
+
+    Images are laid out as <locale>/<canvas size>/<file name> and rendered and
+    PNG-encoded in parallel worker processes; nothing is written outside the
+    archive. A manifest.json with dimensions and SHA-256 hashes is added last.
+
+    Args:
+        config_path: Path to JSON configuration file
+        archive_path: Output archive (.zip, .tar, .tar.gz or .tgz)
+        default_bezels_dir: Default bezels directory (from command-line), used if not specified in config
+        default_canvas_size: Default canvas size (from command-line), used if not specified in config
+        workers: Number of worker processes (default: CPU count)
+        default_backend: Default compositor backend (from command-line), used if not specified in config
+        validate: Check every encoded image against App Store requirements
+
+    Raises:
+        ValueError: If validate is set and any image violates the requirements
+    """
+    _archive_mode(archive_path)  # Reject unsupported archive types before planning
+    jobs = load_plan(config_path, default_bezels_dir, default_canvas_size, True, default_backend)["jobs"]
+
+    manifest = []
+    checked = []
+    with _open_archive(archive_path) as add, ProcessPoolExecutor(max_workers=workers) as pool:
+        # Jobs are ordered most expensive first, which keeps the workers evenly loaded
+        encoded = pool.map(_encode_png, [job["render"] for job in jobs])
+        for i, (job, (data, width, height)) in enumerate(zip(jobs, encoded), 1):
+            digest = hashlib.sha256(data).hexdigest()
+            if validate:
+                _, problems = check_image(io.BytesIO(data), len(data), APPSTORE_DIMENSIONS.values())
+                checked.append((job["targets"][0]["path"], problems))
+            for target in job["targets"]:
+                add(target["path"], data)
+                manifest.append({
+                    "path": target["path"],
+                    "locale": target["locale"],
+                    "canvas_size": job["render"]['canvas_size'],
+                    "width": width,
+                    "height": height,
+                    "bytes": len(data),
+                    "sha256": digest,
+                })
+                print(f"✓ [{i}/{len(jobs)}] {target['path']}")
+        add("manifest.json", json.dumps({"screenshots": manifest}, indent=2, ensure_ascii=False).encode('utf-8'))
+
+    print(f"✓ Exported {len(manifest)} screenshots to {archive_path}")
+
+    if validate:
+        _report_violations(checked)
+
+
+def _report_violations(results: List[Tuple[str, List[str]]]) -> None:
+    """Print App Store validation results, raising ValueError if any file has problems."""
+    violations = [(path, problems) for path, problems in results if problems]
+    if violations:
+        raise ValueError(
+            f"{len(violations)} of {len(results)} screenshots violate App Store requirements:\n"
+            + "\n".join(f"  ✗ {path}: {'; '.join(problems)}" for path, problems in violations)
         )
+    print(f"✓ All {len(results)} screenshots meet App Store requirements")
 
 
 def main():
@@ -676,6 +1159,12 @@ Examples:
 
   # Generate from config file
   python generate_screenshot.py --config screenshots.json
+
+  # Export from config file into an upload-ready archive
+  python generate_screenshot.py --config screenshots.json --export screenshots.zip
+
+  # Validate a config file and print its render plan
+  python generate_screenshot.py --config screenshots.json --plan
         """
     )
 
@@ -695,7 +1184,16 @@ Examples:
                         help='Directory containing device bezels')
     parser.add_argument('--canvas-size', default='iPhone 6.9',
                         help='App Store canvas size (default: iPhone 6.9)')
+    parser.add_argument('--backend', choices=list(COMPOSITOR_BACKENDS), default='pillow',
+                        help='Compositor backend for pixel operations (default: pillow)')
     parser.add_argument('--config', help='JSON configuration file for batch generation')
+    parser.add_argument('--export', metavar='ARCHIVE',
+                        help='With --config, render straight into a .zip/.tar/.tar.gz archive instead of output files')
+    parser.add_argument('--workers', type=int, help='Worker processes for --export (default: CPU count)')
+    parser.add_argument('--validate', action='store_true',
+                        help='With --config, check outputs against App Store requirements after rendering')
+    parser.add_argument('--plan', action='store_true',
+                        help='With --config, validate all entries and print the render plan as JSON without rendering')
     parser.add_argument('--list-devices', action='store_true',
                         help='List available devices and exit')
 
@@ -716,8 +1214,37 @@ Examples:
         return
 
     # Batch generation from config
+    if (args.export or args.plan) and not args.config:
+        parser.error("--export and --plan require --config")
+    if args.export:
+        try:
+            _archive_mode(args.export)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Print the render plan without rendering
+    if args.plan:
+        try:
+            with open(args.config, 'r') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        # Keep progress messages off stdout so the plan stays valid JSON
+        with redirect_stdout(sys.stderr):
+            plan = compile_plan(config, args.bezels_dir, args.canvas_size, bool(args.export), args.backend)
+        print(json.dumps(plan, indent=2, ensure_ascii=False))
+        sys.exit(1 if plan["errors"] else 0)
+
     if args.config:
-        generate_from_config(args.config, args.bezels_dir, args.canvas_size)
+        try:
+            if args.export:
+                export_from_config(args.config, args.export, args.bezels_dir, args.canvas_size, args.workers, args.backend, args.validate)
+            else:
+                generate_from_config(args.config, args.bezels_dir, args.canvas_size, args.backend, args.validate)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
         return
 
     # Single screenshot generation
@@ -736,7 +1263,8 @@ Examples:
             bg_bottom=args.bg_bottom,
             output_path=args.output,
             bezels_dir=args.bezels_dir,
-            canvas_size=args.canvas_size
+            canvas_size=args.canvas_size,
+            backend=args.backend
         )
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
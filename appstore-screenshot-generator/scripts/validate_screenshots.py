@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+App Store Screenshot Validator
+
+Check generated screenshots against App Store upload requirements without decoding
+them. Only the PNG chunk headers (IHDR, tRNS, ...) or JPEG markers up to the frame
+header are read, so thousands of files can be checked in seconds.
+
+Checks:
+    - dimensions match a size in APPSTORE_DIMENSIONS (either orientation)
+    - no alpha channel or transparency
+    - 8-bit RGB color (no grayscale, palette or CMYK)
+    - PNG or JPEG format, under the file-size limit
+
+Usage:
+    python validate_screenshots.py marketing/ --report violations.json
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+
+# Upper bound on file size; adjust with --max-mb if App Store Connect limits change
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+
+# PNG IHDR color types
+PNG_COLOR_TYPES = {0: "L", 2: "RGB", 3: "P", 4: "LA", 6: "RGBA"}
+
+# JPEG start-of-frame markers (baseline, extended, progressive, lossless, ...)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_COMPONENT_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+
+
+def read_png_header(f: BinaryIO) -> Dict:
+    """Read PNG metadata from chunk headers, skipping over chunk data.
+
+    Returns:
+        Dict with format, width, height, bit_depth, mode and has_alpha
+    """
+    if f.read(8) != PNG_SIGNATURE:
+        raise ValueError("not a PNG file")
+
+    length, chunk_type = struct.unpack(">I4s", f.read(8))
+    if chunk_type != b"IHDR" or length != 13:
+        raise ValueError("missing IHDR chunk")
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", f.read(10))
+    if color_type not in PNG_COLOR_TYPES:
+        raise ValueError(f"invalid PNG color type {color_type}")
+    f.seek(3 + 4, os.SEEK_CUR)  # compression, filter, interlace, CRC
+
+    info = {
+        "format": "PNG",
+        "width": width,
+        "height": height,
+        "bit_depth": bit_depth,
+        "mode": PNG_COLOR_TYPES[color_type],
+        "has_alpha": color_type in (4, 6),
+    }
+
+    # Walk the ancillary chunks before image data; a tRNS chunk adds transparency
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            break
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type in (b"IDAT", b"IEND"):
+            break
+        if chunk_type == b"tRNS":
+            info["has_alpha"] = True
+        f.seek(length + 4, os.SEEK_CUR)
+
+    return info
+
+
+def read_jpeg_header(f: BinaryIO) -> Dict:
+    """Read JPEG metadata from markers up to the start-of-frame segment.
+
+    Returns:
+        Dict with format, width, height, bit_depth, mode and has_alpha
+    """
+    if f.read(2) != b"\xff\xd8":
+        raise ValueError("not a JPEG file")
+
+    while True:
+        byte = f.read(1)
+        if not byte:
+            raise ValueError("no JPEG frame header found")
+        if byte != b"\xff":
+            continue
+        marker = f.read(1)
+        while marker == b"\xff":  # fill bytes
+            marker = f.read(1)
+        if not marker:
+            raise ValueError("no JPEG frame header found")
+        code = marker[0]
+        if code == 0xD8 or 0xD0 <= code <= 0xD7 or code == 0x01:
+            continue  # markers without a length
+        segment_length = struct.unpack(">H", f.read(2))[0]
+        if code in JPEG_SOF_MARKERS:
+            precision, height, width, components = struct.unpack(">BHHB", f.read(6))
+            return {
+                "format": "JPEG",
+                "width": width,
+                "height": height,
+                "bit_depth": precision,
+                "mode": JPEG_COMPONENT_MODES.get(components, f"{components} components"),
+                "has_alpha": False,
+            }
+        if code == 0xDA:
+            raise ValueError("no JPEG frame header before scan data")
+        f.seek(segment_length - 2, os.SEEK_CUR)
+
+
+def read_image_header(f: BinaryIO) -> Dict:
+    """Detect the format from the signature and read PNG or JPEG metadata."""
+    signature = f.read(8)
+    f.seek(-len(signature), os.SEEK_CUR)
+    if signature.startswith(PNG_SIGNATURE):
+        return read_png_header(f)
+    if signature.startswith(b"\xff\xd8"):
+        return read_jpeg_header(f)
+    raise ValueError("unsupported format (expected PNG or JPEG)")
+
+
+def check_image(
+    f: BinaryIO,
+    size_bytes: int,
+    allowed_sizes: Iterable[Tuple[int, int]],
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> Tuple[Optional[Dict], List[str]]:
+    """Check one image against the App Store requirements.
+
+    Args:
+        f: Binary file object positioned at the start of the image
+        size_bytes: Total file size in bytes
+        allowed_sizes: Accepted (width, height) pairs; rotated sizes are also accepted
+        max_bytes: File-size limit
+
+    Returns:
+        Tuple of (header info or None if unreadable, list of problems)
+    """
+    try:
+        info = read_image_header(f)
+    except (ValueError, struct.error) as e:
+        return None, [str(e)]
+
+    problems = []
+    sizes = set()
+    for width, height in allowed_sizes:
+        sizes.update({(width, height), (height, width)})
+    if (info["width"], info["height"]) not in sizes:
+        problems.append(f"dimensions {info['width']}x{info['height']} are not an App Store screenshot size")
+    if info["has_alpha"]:
+        problems.append("has an alpha channel or transparency")
+    if info["mode"] != "RGB" and not (info["mode"] == "RGBA" and info["format"] == "PNG"):
+        problems.append(f"color mode {info['mode']} (expected RGB)")
+    if info["bit_depth"] != 8:
+        problems.append(f"{info['bit_depth']}-bit channels (expected 8-bit)")
+    if size_bytes > max_bytes:
+        problems.append(f"file size {size_bytes / 1024 / 1024:.1f} MB exceeds {max_bytes / 1024 / 1024:.1f} MB")
+
+    info["bytes"] = size_bytes
+    return info, problems
+
+
+def validate_file(
+    path: str,
+    allowed_sizes: Iterable[Tuple[int, int]],
+    max_bytes: int = DEFAULT_MAX_BYTES
+) -> Dict:
+    """Validate one file on disk.
+
+    Returns:
+        Result dict with path, header info and a (possibly empty) problems list
+    """
+    try:
+        with open(path, 'rb') as f:
+            info, problems = check_image(f, os.fstat(f.fileno()).st_size, allowed_sizes, max_bytes)
+    except OSError as e:
+        info, problems = None, [f"cannot read file: {e}"]
+    return {"path": str(path), "info": info, "problems": problems}
+
+
+def validate_paths(
+    paths: Iterable[str],
+    allowed_sizes: Iterable[Tuple[int, int]],
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    workers: Optional[int] = None
+) -> List[Dict]:
+    """Validate many files in parallel.
+
+    Header reads are small and I/O bound, so a thread pool is used.
+
+    Args:
+        paths: Files to check
+        allowed_sizes: Accepted (width, height) pairs
+        max_bytes: File-size limit
+        workers: Number of threads (default: 4 x CPU count)
+
+    Returns:
+        One result dict per file, in input order
+    """
+    allowed_sizes = list(allowed_sizes)
+    workers = workers or 4 * (os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda path: validate_file(path, allowed_sizes, max_bytes), paths))
+
+
+def collect_images(targets: Iterable[str]) -> List[str]:
+    """Expand files and directories into a sorted list of PNG/JPEG paths."""
+    paths = []
+    for target in targets:
+        target_path = Path(target)
+        if target_path.is_dir():
+            paths.extend(str(p) for p in target_path.rglob("*")
+                         if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES)
+        else:
+            paths.append(str(target_path))
+    return sorted(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate screenshots against App Store requirements by reading headers only',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Validate a directory and print violations as JSON
+  python validate_screenshots.py marketing/
+
+  # Write the full report to a file
+  python validate_screenshots.py marketing/ --report report.json --all
+        """
+    )
+    parser.add_argument('paths', nargs='+', help='Image files or directories to check')
+    parser.add_argument('--max-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help=f'File-size limit in MB (default: {DEFAULT_MAX_BYTES // 1024 // 1024})')
+    parser.add_argument('--workers', type=int, help='Number of threads (default: 4 x CPU count)')
+    parser.add_argument('--report', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--all', action='store_true', help='Include files without violations in the report')
+
+    args = parser.parse_args()
+
+    from generate_screenshot import APPSTORE_DIMENSIONS
+
+    paths = collect_images(args.paths)
+    results = validate_paths(paths, APPSTORE_DIMENSIONS.values(), int(args.max_mb * 1024 * 1024), args.workers)
+    violations = [r for r in results if r["problems"]]
+
+    report = {
+        "checked": len(results),
+        "violations": len(violations),
+        "files": results if args.all else violations,
+    }
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"✓ Checked {len(results)} files, {len(violations)} with violations: {args.report}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == '__main__':
+    main()
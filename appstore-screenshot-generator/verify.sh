@@ -48,6 +48,15 @@ echo ""
 echo "5. Available devices:"
 python3 scripts/generate_screenshot.py --list-devices 2>/dev/null | grep "  -" | head -5
 
+# Check compositor backends
+echo ""
+echo "6. Checking compositor backends..."
+if python3 scripts/compositor.py --check > /dev/null 2>&1; then
+    echo "   ✅ All available backends match the Pillow reference"
+else
+    echo "   ⚠️  Backend conformance check failed. Run: python scripts/compositor.py --check"
+fi
+
 echo ""
 echo "✅ Skill verification complete!"
 echo ""